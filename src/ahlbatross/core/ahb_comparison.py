@@ -2,12 +2,16 @@
 AHB csv comparison logic.
 """
 
-from typing import List, Tuple
+from collections import defaultdict, deque
+from itertools import takewhile
+from typing import DefaultDict, Deque, Dict, List, Tuple
 
 from ahlbatross.enums.diff_types import DiffType
-from ahlbatross.models.ahb import AhbRow, AhbRowComparison, AhbRowDiff
+from ahlbatross.models.ahb import AHB_COLUMN_NAMES, AhbRow, AhbRowComparison, AhbRowDiff
 from ahlbatross.utils.string_formatting import normalize_entries
-from ahlbatross.utils.xlsx_formatting import AHB_PROPERTIES
+
+# marks a missing row on either side of an aligned row pair
+_GAP = -1
 
 
 def _compare_ahb_rows(previous_ahb_row: AhbRow, subsequent_ahb_row: AhbRow) -> AhbRowDiff:
@@ -17,9 +21,17 @@ def _compare_ahb_rows(previous_ahb_row: AhbRow, subsequent_ahb_row: AhbRow) -> A
     changed_entries = []
 
     # consider all AHB properties except `section_name` (Segmentname) and `formatversion`
-    for entry in AHB_PROPERTIES:
-        previous_ahb_entry = normalize_entries(getattr(previous_ahb_row, entry, "") or "")
-        subsequent_ahb_entry = normalize_entries(getattr(subsequent_ahb_row, entry, "") or "")
+    for entry, previous_ahb_value, subsequent_ahb_value in zip(
+        AHB_COLUMN_NAMES, previous_ahb_row.get_entries(), subsequent_ahb_row.get_entries()
+    ):
+        if entry == "section_name":
+            continue
+        if previous_ahb_value == subsequent_ahb_value:
+            # identical raw entries are identical after normalization as well
+            continue
+
+        previous_ahb_entry = normalize_entries(previous_ahb_value)
+        subsequent_ahb_entry = normalize_entries(subsequent_ahb_value)
 
         if (previous_ahb_entry or subsequent_ahb_entry) and previous_ahb_entry != subsequent_ahb_entry:
             changed_entries.extend(
@@ -49,115 +61,149 @@ def _add_empty_row(formatversion: str) -> AhbRow:
     )
 
 
+def _is_identical_row(previous_ahb_row: AhbRow, subsequent_ahb_row: AhbRow) -> bool:
+    """
+    Check if two rows share the same `section_name` (Segmentname), business key and `segment_id`.
+    """
+    return (
+        previous_ahb_row.get_key() == subsequent_ahb_row.get_key()
+        and previous_ahb_row.segment_id == subsequent_ahb_row.segment_id
+        and normalize_entries(previous_ahb_row.section_name) == normalize_entries(subsequent_ahb_row.section_name)
+    )
+
+
+def _index_section_names(ahb_rows: List[AhbRow], start_idx: int = 0) -> Dict[str, Deque[int]]:
+    """
+    Map each normalized `section_name` (Segmentname) to the ascending positions of all rows carrying it,
+    starting from given index.
+    """
+    section_name_positions: DefaultDict[str, Deque[int]] = defaultdict(deque)
+    for idx in range(start_idx, len(ahb_rows)):
+        section_name_positions[normalize_entries(ahb_rows[idx].section_name)].append(idx)
+    return section_name_positions
+
+
 def _find_matching_subsequent_row(
-    current_ahb_row: AhbRow, subsequent_ahb_rows: List[AhbRow], start_idx: int, duplicate_indices: set[int]
+    current_ahb_row: AhbRow,
+    subsequent_ahb_rows: List[AhbRow],
+    start_idx: int,
+    duplicate_indices: set[int],
+    section_name_positions: Dict[str, Deque[int]],
 ) -> Tuple[int, AhbRow | None]:
     """
     Find matching row in subsequent version starting from given index by consider all AHB properties
     within the same `section_name` group.
+    Only rows listed in `section_name_positions` for the same `section_name` are candidates. Since `start_idx` never
+    decreases during alignment, positions in front of it are discarded from `section_name_positions` for good.
     """
-    normalized_current = normalize_entries(current_ahb_row.section_name)
+    candidate_indices = section_name_positions.get(normalize_entries(current_ahb_row.section_name))
+    if not candidate_indices:
+        return -1, None
+
+    while candidate_indices and candidate_indices[0] < start_idx:
+        candidate_indices.popleft()
+
     current_key = current_ahb_row.get_key()
 
-    for idx, row in enumerate(subsequent_ahb_rows[start_idx:], start_idx):
+    for idx in candidate_indices:
         if idx in duplicate_indices:
             continue
 
-        if (
-            normalize_entries(row.section_name) == normalized_current
-            and row.get_key() == current_key
-            and row.segment_id == current_ahb_row.segment_id
-        ):
+        row = subsequent_ahb_rows[idx]
+        if row.get_key() == current_key and row.segment_id == current_ahb_row.segment_id:
             return idx, row
 
     # in case no match was found, continue by aligning `Segmentname` entries
-    for idx, row in enumerate(subsequent_ahb_rows[start_idx:], start_idx):
+    for idx in candidate_indices:
         if idx in duplicate_indices:
             continue
 
-        if normalize_entries(row.section_name) == normalized_current:
-            if row.ahb_expression is not None and current_ahb_row.ahb_expression is None:
-                continue
-            return idx, row
+        row = subsequent_ahb_rows[idx]
+        if row.ahb_expression is not None and current_ahb_row.ahb_expression is None:
+            continue
+        return idx, row
 
     return -1, None
 
 
-def align_ahb_rows(previous_ahb_rows: List[AhbRow], subsequent_ahb_rows: List[AhbRow]) -> List[AhbRowComparison]:
+def _align_row_indices(previous_ahb_rows: List[AhbRow], subsequent_ahb_rows: List[AhbRow]) -> List[Tuple[int, int]]:
     """
-    Align AHB rows while comparing two formatversions.
+    Align AHB rows of two formatversions by their positions only.
+    Returns pairs of (previous index, subsequent index) where `_GAP` marks a missing row on either side.
     """
-    result = []
-    i = 0
-    j = 0
+    # leading rows that are identical in both formatversions are aligned pairwise right away,
+    # which is exactly how they would be matched below - for unchanged AHBs this covers all rows
+    common_prefix_length = sum(
+        1 for _ in takewhile(lambda rows: _is_identical_row(*rows), zip(previous_ahb_rows, subsequent_ahb_rows))
+    )
+    aligned_indices: List[Tuple[int, int]] = [(idx, idx) for idx in range(common_prefix_length)]
+    section_name_positions = _index_section_names(subsequent_ahb_rows, common_prefix_length)
+    i = common_prefix_length
+    j = common_prefix_length
     duplicate_indices: set[int] = set()
 
-    while i < len(previous_ahb_rows) or j < len(subsequent_ahb_rows):
-        if i >= len(previous_ahb_rows):
-            # add remaining rows as "new" if not already used
-            if j not in duplicate_indices:
-                result.append(
-                    AhbRowComparison(
-                        previous_formatversion=_add_empty_row(subsequent_ahb_rows[j].formatversion),
-                        diff=AhbRowDiff(diff_type=DiffType.ADDED),
-                        subsequent_formatversion=subsequent_ahb_rows[j],
-                    )
-                )
-            j += 1
-            continue
-
-        if j >= len(subsequent_ahb_rows):
-            result.append(
-                AhbRowComparison(
-                    previous_formatversion=previous_ahb_rows[i],
-                    # label remaining rows of previous AHB as REMOVED
-                    diff=AhbRowDiff(diff_type=DiffType.REMOVED),
-                    subsequent_formatversion=_add_empty_row(previous_ahb_rows[i].formatversion),
-                )
-            )
-            i += 1
-            continue
-
-        current_row = previous_ahb_rows[i]
+    while i < len(previous_ahb_rows) and j < len(subsequent_ahb_rows):
         next_match_idx, matching_row = _find_matching_subsequent_row(
-            current_row, subsequent_ahb_rows, j, duplicate_indices
+            previous_ahb_rows[i], subsequent_ahb_rows, j, duplicate_indices, section_name_positions
         )
 
         if next_match_idx >= 0 and matching_row is not None:
             # add new rows until `section_name` (Segmentname) matches
-            while j < next_match_idx:
-                if j not in duplicate_indices:
-                    result.append(
-                        AhbRowComparison(
-                            previous_formatversion=_add_empty_row(subsequent_ahb_rows[j].formatversion),
-                            diff=AhbRowDiff(diff_type=DiffType.ADDED),
-                            subsequent_formatversion=subsequent_ahb_rows[j],
-                        )
-                    )
-                j += 1
+            aligned_indices.extend((_GAP, idx) for idx in range(j, next_match_idx) if idx not in duplicate_indices)
 
-            # add matching rows with comparison
-            diff = _compare_ahb_rows(current_row, matching_row)
-            result.append(
-                AhbRowComparison(
-                    previous_formatversion=current_row,
-                    diff=diff,
-                    subsequent_formatversion=matching_row,
-                )
-            )
+            aligned_indices.append((i, next_match_idx))
             duplicate_indices.add(next_match_idx)
             i += 1
             j = next_match_idx + 1
 
         else:
             # if no match found - label as REMOVED
+            aligned_indices.append((i, _GAP))
+            i += 1
+
+    # at most one of both AHBs has rows left, which are added in bulk
+    # label remaining rows of previous AHB as REMOVED
+    aligned_indices.extend((idx, _GAP) for idx in range(i, len(previous_ahb_rows)))
+    # add remaining rows as "new" if not already used
+    aligned_indices.extend((_GAP, idx) for idx in range(j, len(subsequent_ahb_rows)) if idx not in duplicate_indices)
+
+    return aligned_indices
+
+
+def align_ahb_rows(previous_ahb_rows: List[AhbRow], subsequent_ahb_rows: List[AhbRow]) -> List[AhbRowComparison]:
+    """
+    Align AHB rows while comparing two formatversions.
+    """
+    result = []
+    for previous_idx, subsequent_idx in _align_row_indices(previous_ahb_rows, subsequent_ahb_rows):
+        if previous_idx == _GAP:
+            subsequent_row = subsequent_ahb_rows[subsequent_idx]
+            result.append(
+                AhbRowComparison(
+                    previous_formatversion=_add_empty_row(subsequent_row.formatversion),
+                    diff=AhbRowDiff(diff_type=DiffType.ADDED),
+                    subsequent_formatversion=subsequent_row,
+                )
+            )
+        elif subsequent_idx == _GAP:
+            previous_row = previous_ahb_rows[previous_idx]
             result.append(
                 AhbRowComparison(
-                    previous_formatversion=current_row,
+                    previous_formatversion=previous_row,
                     diff=AhbRowDiff(diff_type=DiffType.REMOVED),
-                    subsequent_formatversion=_add_empty_row(current_row.formatversion),
+                    subsequent_formatversion=_add_empty_row(previous_row.formatversion),
+                )
+            )
+        else:
+            # add matching rows with comparison
+            previous_row = previous_ahb_rows[previous_idx]
+            subsequent_row = subsequent_ahb_rows[subsequent_idx]
+            result.append(
+                AhbRowComparison(
+                    previous_formatversion=previous_row,
+                    diff=_compare_ahb_rows(previous_row, subsequent_row),
+                    subsequent_formatversion=subsequent_row,
                 )
             )
-            i += 1
 
     return result
@@ -3,7 +3,11 @@ AHB file handling as well as data fetching and parsing logic.
 """
 
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
+from typing import Callable
 
 from ahlbatross.core.ahb_comparison import align_ahb_rows
 from ahlbatross.formats.csv import export_to_csv, get_csv_files, load_csv_files
@@ -12,6 +16,9 @@ from ahlbatross.utils.formatversion_parsing import parse_formatversions
 
 logger = logging.getLogger(__name__)
 
+# directory listings shared by all lookups within a single `process_ahb_files` run
+DirectoryListings = dict[Path, list[Path]]
+
 
 def _is_formatversion_dir(path: Path) -> bool:
     """
@@ -20,7 +27,22 @@ def _is_formatversion_dir(path: Path) -> bool:
     return path.is_dir() and path.name.startswith("FV") and len(path.name) == 6
 
 
-def _is_formatversion_dir_empty(root_dir: Path, formatversion: str) -> bool:
+def _get_directory_listing(
+    directory: Path, list_directory: Callable[[Path], list[Path]], directory_listings: DirectoryListings | None
+) -> list[Path]:
+    """
+    List a directory via `list_directory`, reusing a listing from `directory_listings` if available.
+    """
+    if directory_listings is None:
+        return list_directory(directory)
+    if directory not in directory_listings:
+        directory_listings[directory] = list_directory(directory)
+    return directory_listings[directory]
+
+
+def _is_formatversion_dir_empty(
+    root_dir: Path, formatversion: str, directory_listings: DirectoryListings | None = None
+) -> bool:
     """
     Check if a <formatversion> directory does not contain any <nachrichtenformat> directories.
     """
@@ -28,7 +50,7 @@ def _is_formatversion_dir_empty(root_dir: Path, formatversion: str) -> bool:
     if not formatversion_dir.exists():
         return True
 
-    return len(_get_nachrichtenformat_dirs(formatversion_dir)) == 0
+    return len(_get_directory_listing(formatversion_dir, _get_nachrichtenformat_dirs, directory_listings)) == 0
 
 
 def _get_formatversion_dirs(root_dir: Path) -> list[str]:
@@ -50,23 +72,36 @@ def _get_nachrichtenformat_dirs(formatversion_dir: Path) -> list[Path]:
     if not formatversion_dir.exists():
         raise FileNotFoundError(f"❌ Formatversion directory not found: {formatversion_dir.absolute()}")
 
-    return [d for d in formatversion_dir.iterdir() if d.is_dir() and (d / "csv").exists() and (d / "csv").is_dir()]
+    # `entry.is_dir()` reuses the file type reported by `os.scandir`, only the csv/ subdirectory check needs a `stat`
+    with os.scandir(formatversion_dir) as entries:
+        return [
+            Path(entry.path) for entry in entries if entry.is_dir() and os.path.isdir(os.path.join(entry.path, "csv"))
+        ]
 
 
-def get_formatversion_pairs(root_dir: Path) -> list[tuple[str, str]]:
+def get_formatversion_pairs(
+    root_dir: Path, directory_listings: DirectoryListings | None = None
+) -> list[tuple[str, str]]:
     """
     Generate pairs of consecutive <formatversion> directories.
+    Pass `directory_listings` to share directory listings with subsequent lookups of the same run.
     """
     formatversion_list = _get_formatversion_dirs(root_dir)
     logger.debug("Found formatversions: %s", formatversion_list)  # Debug all found versions
 
+    # each formatversion is part of up to two pairs - check for empty directories only once per formatversion
+    is_formatversion_empty = {
+        formatversion: _is_formatversion_dir_empty(root_dir, formatversion, directory_listings)
+        for formatversion in formatversion_list
+    }
+
     consecutive_formatversions = []
     for i in range(len(formatversion_list) - 1):
         subsequent_formatversion = formatversion_list[i]
         previous_formatversion = formatversion_list[i + 1]
 
-        is_subsequent_empty = _is_formatversion_dir_empty(root_dir, subsequent_formatversion)
-        is_previous_empty = _is_formatversion_dir_empty(root_dir, previous_formatversion)
+        is_subsequent_empty = is_formatversion_empty[subsequent_formatversion]
+        is_previous_empty = is_formatversion_empty[previous_formatversion]
         logger.debug(
             "⌛ Checking pair %s -> %s (empty: %s, %s)",
             subsequent_formatversion,
@@ -91,10 +126,14 @@ def get_formatversion_pairs(root_dir: Path) -> list[tuple[str, str]]:
 
 # pylint:disable=too-many-locals
 def get_matching_csv_files(
-    root_dir: Path, previous_formatversion: str, subsequent_formatversion: str
+    root_dir: Path,
+    previous_formatversion: str,
+    subsequent_formatversion: str,
+    directory_listings: DirectoryListings | None = None,
 ) -> list[tuple[Path, Path, str, str]]:
     """
     Find matching <pruefid>.csv files across <formatversion>/<nachrichtenformat> directories.
+    Pass `directory_listings` to share directory listings with other lookups of the same run.
     """
     previous_formatversion_dir = root_dir / previous_formatversion
     subsequent_formatversion_dir = root_dir / subsequent_formatversion
@@ -105,24 +144,31 @@ def get_matching_csv_files(
 
     matching_files = []
 
-    previous_nachrichtenformat_dirs = _get_nachrichtenformat_dirs(previous_formatversion_dir)
-    subsequent_nachrichtenformat_dirs = _get_nachrichtenformat_dirs(subsequent_formatversion_dir)
+    previous_nachrichtenformat_dirs = _get_directory_listing(
+        previous_formatversion_dir, _get_nachrichtenformat_dirs, directory_listings
+    )
+    subsequent_nachrichtenformat_dirs = _get_directory_listing(
+        subsequent_formatversion_dir, _get_nachrichtenformat_dirs, directory_listings
+    )
 
     previous_nachrichtenformat_names = {d.name: d for d in previous_nachrichtenformat_dirs}
     subsequent_nachrichtenformat_names = {d.name: d for d in subsequent_nachrichtenformat_dirs}
 
-    common_nachrichtentyp = set(previous_nachrichtenformat_names.keys()) & set(
-        subsequent_nachrichtenformat_names.keys()
-    )
+    # dict key views support set operations directly without copying the keys into intermediate sets
+    common_nachrichtentyp = previous_nachrichtenformat_names.keys() & subsequent_nachrichtenformat_names.keys()
 
     for nachrichtentyp in sorted(common_nachrichtentyp):
         previous_csv_dir = previous_nachrichtenformat_names[nachrichtentyp] / "csv"
         subsequent_csv_dir = subsequent_nachrichtenformat_names[nachrichtentyp] / "csv"
 
-        previous_files = {f.stem: f for f in get_csv_files(previous_csv_dir)}
-        subsequent_files = {f.stem: f for f in get_csv_files(subsequent_csv_dir)}
+        previous_files = {
+            f.stem: f for f in _get_directory_listing(previous_csv_dir, get_csv_files, directory_listings)
+        }
+        subsequent_files = {
+            f.stem: f for f in _get_directory_listing(subsequent_csv_dir, get_csv_files, directory_listings)
+        }
 
-        common_ahbs = set(previous_files.keys()) & set(subsequent_files.keys())
+        common_ahbs = previous_files.keys() & subsequent_files.keys()
 
         for pruefid in sorted(common_ahbs):
             matching_files.append((previous_files[pruefid], subsequent_files[pruefid], nachrichtentyp, pruefid))
@@ -130,63 +176,93 @@ def get_matching_csv_files(
     return matching_files
 
 
-def process_ahb_files(input_dir: Path, output_dir: Path) -> None:
+# pylint:disable=too-many-arguments, too-many-positional-arguments
+def _process_pruefid(
+    previous_pruefid: Path,
+    subsequent_pruefid: Path,
+    nachrichtentyp: str,
+    pruefid: str,
+    previous_formatversion: str,
+    subsequent_formatversion: str,
+    output_dir: Path,
+) -> None:
     """
-    Process all matching ahb/<pruefid>.csv files between two <formatversion> directories including respective
-    subdirectories of all valid consecutive <formatversion> pairs.
+    Compare a single pair of <pruefid>.csv files and export the result as csv and xlsx.
+    Defined on module level so that it can be dispatched to worker processes.
     """
-    logger.info("Found AHB root directory at: %s", input_dir.absolute())
-    logger.info("Output directory: %s", output_dir.absolute())
+    logger.info("Processing %s - %s", nachrichtentyp, pruefid)
 
-    consecutive_formatversions = get_formatversion_pairs(input_dir)
-    if not consecutive_formatversions:
-        logger.warning("❗️ No valid consecutive formatversion subdirectories found to compare.")
-        return
-
-    for subsequent_formatversion, previous_formatversion in consecutive_formatversions:
-        logger.info(
-            "⌛ Processing consecutive formatversions: %s -> %s", subsequent_formatversion, previous_formatversion
+    try:
+        previous_rows, subsequent_rows = load_csv_files(
+            previous_pruefid, subsequent_pruefid, previous_formatversion, subsequent_formatversion
         )
 
-        try:
-            matching_files = get_matching_csv_files(input_dir, previous_formatversion, subsequent_formatversion)
+        comparisons = align_ahb_rows(previous_rows, subsequent_rows)
 
-            if not matching_files:
-                logger.warning("No matching files found to compare")
-                continue
+        output_dir_path = output_dir / f"{subsequent_formatversion}_{previous_formatversion}" / nachrichtentyp
+        output_dir_path.mkdir(parents=True, exist_ok=True)
 
-            for previous_pruefid, subsequent_pruefid, nachrichtentyp, pruefid in matching_files:
-                logger.info("Processing %s - %s", nachrichtentyp, pruefid)
+        csv_path = output_dir_path / f"{pruefid}.csv"
+        xlsx_path = output_dir_path / f"{pruefid}.xlsx"
 
-                try:
-                    previous_rows, subsequent_rows = load_csv_files(
-                        previous_pruefid, subsequent_pruefid, previous_formatversion, subsequent_formatversion
-                    )
+        # write the csv file in a background thread while the (more expensive) xlsx file is assembled
+        with ThreadPoolExecutor(max_workers=1) as csv_executor:
+            csv_export = csv_executor.submit(export_to_csv, comparisons, csv_path)
+            export_to_xlsx(comparisons, str(xlsx_path))
+            csv_export.result()
 
-                    comparisons = align_ahb_rows(previous_rows, subsequent_rows)
+        logger.info("✅ Successfully processed %s/%s", nachrichtentyp, pruefid)
 
-                    output_dir_path = (
-                        output_dir / f"{subsequent_formatversion}_{previous_formatversion}" / nachrichtentyp
-                    )
-                    output_dir_path.mkdir(parents=True, exist_ok=True)
+    except (OSError, IOError, ValueError) as e:
+        logger.error("❌ Error processing %s/%s: %s", nachrichtentyp, pruefid, str(e))
 
-                    csv_path = output_dir_path / f"{pruefid}.csv"
-                    xlsx_path = output_dir_path / f"{pruefid}.xlsx"
 
-                    export_to_csv(comparisons, csv_path)
-                    export_to_xlsx(comparisons, str(xlsx_path))
+def process_ahb_files(input_dir: Path, output_dir: Path) -> None:
+    """
+    Process all matching ahb/<pruefid>.csv files between two <formatversion> directories including respective
+    subdirectories of all valid consecutive <formatversion> pairs.
+    Every pair of <pruefid>.csv files is independent of all others, hence they are processed in parallel.
+    """
+    logger.info("Found AHB root directory at: %s", input_dir.absolute())
+    logger.info("Output directory: %s", output_dir.absolute())
 
-                    logger.info("✅ Successfully processed %s/%s", nachrichtentyp, pruefid)
+    # every interior <formatversion> directory is part of two pairs - list its directories only once per run
+    directory_listings: DirectoryListings = {}
 
-                except (OSError, IOError, ValueError) as e:
-                    logger.error("❌ Error processing %s/%s: %s", nachrichtentyp, pruefid, str(e))
-                    continue
+    consecutive_formatversions = get_formatversion_pairs(input_dir, directory_listings)
+    if not consecutive_formatversions:
+        logger.warning("❗️ No valid consecutive formatversion subdirectories found to compare.")
+        return
 
-        except (OSError, IOError, ValueError) as e:
-            logger.error(
-                "❌ Error processing formatversions %s -> %s: %s",
-                subsequent_formatversion,
-                previous_formatversion,
-                str(e),
+    with ProcessPoolExecutor() as executor:
+        for subsequent_formatversion, previous_formatversion in consecutive_formatversions:
+            logger.info(
+                "⌛ Processing consecutive formatversions: %s -> %s", subsequent_formatversion, previous_formatversion
             )
-            continue
+
+            try:
+                matching_files = get_matching_csv_files(
+                    input_dir, previous_formatversion, subsequent_formatversion, directory_listings
+                )
+
+                if not matching_files:
+                    logger.warning("No matching files found to compare")
+                    continue
+
+                process_pruefid = partial(
+                    _process_pruefid,
+                    previous_formatversion=previous_formatversion,
+                    subsequent_formatversion=subsequent_formatversion,
+                    output_dir=output_dir,
+                )
+                # consume all results to wait for the workers and to re-raise unexpected errors
+                list(executor.map(process_pruefid, *zip(*matching_files), chunksize=4))
+
+            except (OSError, IOError, ValueError) as e:
+                logger.error(
+                    "❌ Error processing formatversions %s -> %s: %s",
+                    subsequent_formatversion,
+                    previous_formatversion,
+                    str(e),
+                )
+                continue
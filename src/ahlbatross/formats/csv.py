@@ -3,6 +3,7 @@ Functions for reading and writing csv files.
 """
 
 import csv
+import os
 from pathlib import Path
 from typing import List, Tuple
 
@@ -13,30 +14,67 @@ def get_csv_files(csv_dir: Path) -> list[Path]:
     """
     Find and return all <pruefid>.csv files in a given directory.
     """
-    if not csv_dir.exists():
+    if not csv_dir.is_dir():
         return []
-    return sorted(csv_dir.glob("*.csv"))
+    # `entry.is_file()` is answered from the directory listing itself instead of a `stat` call per file
+    with os.scandir(csv_dir) as entries:
+        csv_files = [Path(entry.path) for entry in entries if entry.name.endswith(".csv") and entry.is_file()]
+    csv_files.sort()
+    return csv_files
 
 
+def _get_cell(row: List[str], position: int | None) -> str | None:
+    """
+    Return the entry at a given column position of a csv row or None for absent columns / cells.
+    """
+    if position is None or position >= len(row):
+        return None
+    return row[position]
+
+
+# pylint:disable=too-many-locals
 def read_csv_content(file_path: Path, formatversion: str) -> List[AhbRow]:
     """
     Read and convert AHB csv content to AhbRow models.
     """
-    rows = []
+    rows: List[AhbRow] = []
     with open(file_path, "r", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
+        reader = csv.reader(csvfile)
+        header = next(reader, None)
+        if header is None:
+            return rows
+
+        # resolve the positions of all relevant columns once per file instead of building a dict for every row
+        column_positions = {column: position for position, column in enumerate(header)}
+        section_name_position = column_positions.get("Segmentname")
+        segment_group_key_position = column_positions.get("Segmentgruppe")
+        segment_code_position = column_positions.get("Segment")
+        data_element_position = column_positions.get("Datenelement")
+        segment_id_position = column_positions.get("Segment ID")
+        code_position = column_positions.get("Code")
+        qualifier_position = column_positions.get("Qualifier")
+        name_position = column_positions.get("Beschreibung")
+        ahb_expression_position = column_positions.get("Bedingungsausdruck")
+        conditions_position = column_positions.get("Bedingung")
+
         for row in reader:
+            if not row:
+                # skip blank lines
+                continue
+            if section_name_position is None:
+                # like `csv.DictReader` lookups, a missing `Segmentname` column only fails for files with data rows
+                raise KeyError("Segmentname")
             ahb_row = AhbRow(
                 formatversion=formatversion,
-                section_name=row["Segmentname"],
-                segment_group_key=row.get("Segmentgruppe"),
-                segment_code=row.get("Segment"),
-                data_element=row.get("Datenelement"),
-                segment_id=row.get("Segment ID"),
-                value_pool_entry=row.get("Code") or row.get("Qualifier"),
-                name=row.get("Beschreibung"),
-                ahb_expression=row.get("Bedingungsausdruck"),
-                conditions=row.get("Bedingung"),
+                section_name=_get_cell(row, section_name_position),
+                segment_group_key=_get_cell(row, segment_group_key_position),
+                segment_code=_get_cell(row, segment_code_position),
+                data_element=_get_cell(row, data_element_position),
+                segment_id=_get_cell(row, segment_id_position),
+                value_pool_entry=_get_cell(row, code_position) or _get_cell(row, qualifier_position),
+                name=_get_cell(row, name_position),
+                ahb_expression=_get_cell(row, ahb_expression_position),
+                conditions=_get_cell(row, conditions_position),
             )
             rows.append(ahb_row)
     return rows
@@ -89,27 +127,13 @@ def export_to_csv(comparisons: list[AhbRowComparison], csv_path: Path) -> None:
         ]
         writer.writerow(headers)
 
-        for row_num, comp in enumerate(comparisons, start=1):
-            row = [
-                str(row_num),  # column for row numbering to preserve the AHB properties order
-                comp.previous_formatversion.section_name or "",
-                comp.previous_formatversion.segment_group_key or "",
-                comp.previous_formatversion.segment_code or "",
-                comp.previous_formatversion.data_element or "",
-                comp.previous_formatversion.segment_id or "",
-                comp.previous_formatversion.value_pool_entry or "",
-                comp.previous_formatversion.name or "",
-                comp.previous_formatversion.ahb_expression or "",
-                comp.previous_formatversion.conditions or "",
+        # rows are passed as tuples with a fixed column order to a single `writerows` call
+        writer.writerows(
+            (
+                row_num,  # column for row numbering to preserve the AHB properties order
+                *comp.previous_formatversion.get_entries(),
                 comp.diff.diff_type.value,
-                comp.subsequent_formatversion.section_name or "",
-                comp.subsequent_formatversion.segment_group_key or "",
-                comp.subsequent_formatversion.segment_code or "",
-                comp.subsequent_formatversion.data_element or "",
-                comp.subsequent_formatversion.segment_id or "",
-                comp.subsequent_formatversion.value_pool_entry or "",
-                comp.subsequent_formatversion.name or "",
-                comp.subsequent_formatversion.ahb_expression or "",
-                comp.subsequent_formatversion.conditions or "",
-            ]
-            writer.writerow(row)
+                *comp.subsequent_formatversion.get_entries(),
+            )
+            for row_num, comp in enumerate(comparisons, start=1)
+        )
@@ -2,8 +2,10 @@
 Contains excel export logic.
 """
 
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from xlsxwriter import Workbook  # type: ignore
 from xlsxwriter.format import Format  # type: ignore
@@ -11,11 +13,10 @@ from xlsxwriter.worksheet import Worksheet  # type: ignore
 
 from ahlbatross.enums.diff_types import DiffType
 from ahlbatross.logger import logger
-from ahlbatross.models.ahb import AhbRow, AhbRowComparison, AhbRowDiff
+from ahlbatross.models.ahb import AHB_COLUMN_NAMES, AhbRow, AhbRowComparison, AhbRowDiff
 from ahlbatross.utils.xlsx_formatting import (
     ADDED_LABEL_FORMAT,
     ADDED_LABEL_HIGHLIGHTING,
-    AHB_COLUMN_NAMES,
     ALTERING_SEGMENTNAME_FORMAT,
     CELL_FORMAT,
     CUSTOM_COLUMN_WIDTHS,
@@ -30,6 +31,12 @@ from ahlbatross.utils.xlsx_formatting import (
 )
 
 FormatDict = Dict[str, Format]
+# (diff type, is new segment, is previous formatversion, formatversion, changed entries)
+RowFormatKey = Tuple[str, bool, bool, str, Tuple[str, ...]]
+RowFormatCache = Dict[RowFormatKey, List[Format]]
+
+# number of rows above which xlsx files are written in xlsxwriter's `constant_memory` mode
+CONSTANT_MEMORY_ROW_THRESHOLD = 10_000
 
 
 def _create_headers(sample: AhbRowComparison) -> List[str]:
@@ -74,39 +81,49 @@ def _write_row_entries(
     diff_formats: FormatDict,
     highlight_segmentname: FormatDict,
     base_format: Format,
+    format_cache: RowFormatCache,
     _is_previous_formatversion: bool = True,
 ) -> None:
     """
     Writes entries to cells row by row.
+    The formats of a row only depend on its DIFF and `Segmentname` state, hence they are resolved once per distinct
+    state and then reused via `format_cache`.
     """
 
-    values = [
-        row.section_name or "",
-        row.segment_group_key or "",
-        row.segment_code or "",
-        row.data_element or "",
-        row.segment_id or "",
-        row.value_pool_entry or "",
-        row.name or "",
-        row.ahb_expression or "",
-        row.conditions or "",
-    ]
+    values = row.get_entries()
+
+    format_key = (
+        diff.diff_type,
+        is_new_segment,
+        _is_previous_formatversion,
+        row.formatversion,
+        tuple(diff.changed_entries),
+    )
+    formats = format_cache.get(format_key)
+    if formats is None:
+        formats = [
+            _determine_segmentname_format(
+                diff_type=diff.diff_type,
+                is_segmentname=col_offset == 0,
+                is_new_segment=is_new_segment,
+                diff_formats=diff_formats,
+                highlight_segmentname=highlight_segmentname,
+                base_format=base_format,
+                is_previous_formatversion=_is_previous_formatversion,
+                column_name=f"{column_name}_{row.formatversion}",
+                changed_entries=diff.changed_entries,
+            )
+            for col_offset, column_name in enumerate(AHB_COLUMN_NAMES)
+        ]
+        format_cache[format_key] = formats
 
-    for col_offset, (column_name, value) in enumerate(zip(AHB_COLUMN_NAMES, values)):
-        col = start_col + col_offset
-        is_segmentname = col_offset == 0
-        format_to_use = _determine_segmentname_format(
-            diff_type=diff.diff_type,
-            is_segmentname=is_segmentname,
-            is_new_segment=is_new_segment,
-            diff_formats=diff_formats,
-            highlight_segmentname=highlight_segmentname,
-            base_format=base_format,
-            is_previous_formatversion=_is_previous_formatversion,
-            column_name=f"{column_name}_{row.formatversion}",
-            changed_entries=diff.changed_entries,
-        )
-        worksheet.write(row_num, col, str(value), format_to_use)
+    # consecutive cells sharing the same format are written with a single `write_row` call
+    col = start_col
+    for format_to_use, cells in groupby(zip(values, formats), key=itemgetter(1)):
+        # all values are already strings - `get_entries` replaces absent entries by ""
+        cell_values = [value for value, _ in cells]
+        worksheet.write_row(row_num, col, cell_values, format_to_use)
+        col += len(cell_values)
 
 
 # pylint:disable=too-many-arguments, too-many-positional-arguments, too-many-return-statements
@@ -206,7 +223,11 @@ def export_to_xlsx(comparisons: List[AhbRowComparison], output_path_xlsx: str) -
     """
     sheet_name = Path(output_path_xlsx).stem
 
-    with Workbook(output_path_xlsx) as workbook:
+    # rows are written strictly in order, hence large sheets can flush each row to disk as soon as the next one starts
+    # instead of keeping all cells in memory until the workbook is closed (at the cost of a slightly larger file)
+    workbook_options = {"constant_memory": len(comparisons) > CONSTANT_MEMORY_ROW_THRESHOLD}
+
+    with Workbook(output_path_xlsx, workbook_options) as workbook:
         worksheet = workbook.add_worksheet(sheet_name)
 
         header_format = workbook.add_format(HEADER_FORMAT)
@@ -215,6 +236,7 @@ def export_to_xlsx(comparisons: List[AhbRowComparison], output_path_xlsx: str) -
         diff_formats = _create_diff_label_highlighting_formats(workbook)
         highlight_segmentname = _create_segmentname_highlight_formats(workbook)
         diff_text_formats = _create_diff_label_text_formats(workbook)
+        format_cache: RowFormatCache = {}
 
         headers = _create_headers(comparisons[0])
         for col, header in enumerate(headers):
@@ -238,11 +260,12 @@ def export_to_xlsx(comparisons: List[AhbRowComparison], output_path_xlsx: str) -
                 diff_formats=diff_formats,
                 highlight_segmentname=highlight_segmentname,
                 base_format=base_format,
+                format_cache=format_cache,
                 _is_previous_formatversion=True,
             )
 
             # DIFF column
-            diff_value = comp.diff.diff_type.value if comp.diff.diff_type.value else ""
+            diff_value = comp.diff.diff_type.value
             worksheet.write(row_num, 10, diff_value, diff_text_formats.get(diff_value, diff_text_formats[""]))
 
             # AHB: subsequent formatversion - columns
@@ -256,6 +279,7 @@ def export_to_xlsx(comparisons: List[AhbRowComparison], output_path_xlsx: str) -
                 diff_formats=diff_formats,
                 highlight_segmentname=highlight_segmentname,
                 base_format=base_format,
+                format_cache=format_cache,
                 _is_previous_formatversion=False,
             )
 
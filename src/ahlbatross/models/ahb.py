@@ -3,6 +3,7 @@ Classes that are used to compare AHBs between two formatversions row by row and
 """
 
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import List, Optional
 
 from kohlrahbi.models.anwendungshandbuch import AhbLine
@@ -10,6 +11,24 @@ from pydantic import BaseModel, Field
 
 from ahlbatross.enums.diff_types import DiffType
 
+# AhbRow properties (1)-(9) in the column order of the csv/xlsx output
+AHB_COLUMN_NAMES = [
+    "section_name",
+    "segment_group_key",
+    "segment_code",
+    "data_element",
+    "segment_id",
+    "value_pool_entry",
+    "name",
+    "ahb_expression",
+    "conditions",
+]
+
+AHB_PROPERTIES = [name for name in AHB_COLUMN_NAMES if name != "section_name"]
+
+# fetches all AHB properties (1)-(9) of a row in one call
+_get_ahb_entries = attrgetter(*AHB_COLUMN_NAMES)
+
 
 @dataclass(frozen=True)
 class AhbRowKey:
@@ -47,6 +66,12 @@ class AhbRow(AhbLine):
             segment_group_key=self.segment_group_key, segment_code=self.segment_code, data_element=self.data_element
         )
 
+    def get_entries(self) -> List[str]:
+        """
+        Returns all AHB properties (1)-(9) in column order, with absent entries as empty strings.
+        """
+        return [entry or "" for entry in _get_ahb_entries(self)]
+
 
 class AhbRowDiff(BaseModel):
     """
@@ -4,6 +4,8 @@ Utility functions for string operations.
 
 import re
 
+_WHITESPACES = re.compile(r"\s+")
+
 
 def normalize_entries(value: str | None) -> str:
     """
@@ -11,4 +13,4 @@ def normalize_entries(value: str | None) -> str:
     """
     if value is None:
         return ""
-    return re.sub(r"\s+", "", value)
+    return _WHITESPACES.sub("", value)
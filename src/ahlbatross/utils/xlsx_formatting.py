@@ -4,6 +4,13 @@ Contains xlsx formatting constants and type definitions.
 
 from typing import TypedDict
 
+# the column order is defined next to the AhbRow model; re-exported here for backwards compatibility
+# pylint:disable=unused-import,useless-import-alias
+from ahlbatross.models.ahb import AHB_COLUMN_NAMES as AHB_COLUMN_NAMES
+from ahlbatross.models.ahb import AHB_PROPERTIES as AHB_PROPERTIES
+
+# pylint:enable=unused-import,useless-import-alias
+
 
 class FormattingOptions(TypedDict, total=False):
     """
@@ -88,17 +95,3 @@ CUSTOM_COLUMN_WIDTHS = {
     "Beschreibung_": 150,
     "Bedingung_": 250,
 }
-
-AHB_COLUMN_NAMES = [
-    "section_name",
-    "segment_group_key",
-    "segment_code",
-    "data_element",
-    "segment_id",
-    "value_pool_entry",
-    "name",
-    "ahb_expression",
-    "conditions",
-]
-
-AHB_PROPERTIES = [name for name in AHB_COLUMN_NAMES if name != "section_name"]
@@ -1191,3 +1191,59 @@ class TestMultiColumnComparisons:
         assert "segment_group_key" in str(changed_entries)
         assert "data_element" in str(changed_entries)
         assert "value_pool_entry" not in str(changed_entries)
+
+    def test_align_rows_common_prefix(self) -> None:
+        section_names = ["Nachrichten-Kopfsegment", "Beginn der Nachricht", "Nachrichten-Datum"]
+        previous_ahb_rows = [
+            AhbRow(
+                formatversion=self.formatversions.previous_formatversion,
+                section_name=section_name,
+                segment_group_key="SG1",
+                segment_code="AAA",
+                value_pool_entry="XXX",
+                name="Beschreibung_alt",
+            )
+            for section_name in section_names
+        ]
+        subsequent_ahb_rows = [
+            AhbRow(
+                formatversion=self.formatversions.subsequent_formatversion,
+                section_name=section_name,
+                segment_group_key="SG1",
+                segment_code="AAA",
+                value_pool_entry="XXX",
+                name="Beschreibung_neu" if section_name == "Beginn der Nachricht" else "Beschreibung_alt",
+            )
+            for section_name in section_names + ["Referenz"]
+        ]
+
+        result = align_ahb_rows(previous_ahb_rows, subsequent_ahb_rows)
+
+        assert len(result) == 4
+        assert [comparison.diff.diff_type for comparison in result] == [
+            DiffType.UNCHANGED,
+            DiffType.MODIFIED,
+            DiffType.UNCHANGED,
+            DiffType.ADDED,
+        ]
+        assert result[1].diff.changed_entries == [
+            f"name_{self.formatversions.previous_formatversion}",
+            f"name_{self.formatversions.subsequent_formatversion}",
+        ]
+        assert result[3].subsequent_formatversion.section_name == "Referenz"
+
+    def test_align_rows_separate_empty_rows(self) -> None:
+        previous_ahb_rows = [
+            AhbRow(
+                formatversion=self.formatversions.previous_formatversion,
+                section_name=section_name,
+                value_pool_entry=None,
+                name=None,
+            )
+            for section_name in ["Nachrichten-Kopfsegment", "Beginn der Nachricht"]
+        ]
+
+        result = align_ahb_rows(previous_ahb_rows, [])
+
+        assert len(result) == 2
+        assert result[0].subsequent_formatversion is not result[1].subsequent_formatversion
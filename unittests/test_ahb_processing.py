@@ -1,8 +1,9 @@
+import shutil
 from pathlib import Path
 
 import pytest
 
-from ahlbatross.core.ahb_processing import get_formatversion_pairs, get_matching_csv_files
+from ahlbatross.core.ahb_processing import get_formatversion_pairs, get_matching_csv_files, process_ahb_files
 from ahlbatross.utils.formatversion_parsing import parse_formatversions
 
 
@@ -92,3 +93,51 @@ def test_determine_consecutive_formatversions(tmp_path: Path) -> None:
 
     result = get_formatversion_pairs(root_dir=tmp_path)
     assert result == [("FV2504", "FV2410")]
+
+
+def test_process_ahb_files(tmp_path: Path) -> None:
+    """
+    test processing of all matching <pruefid>.csv files of consecutive formatversions.
+    """
+    test_data_dir = Path(__file__).parent / "test_data"
+    input_dir = tmp_path / "input"
+    output_dir = tmp_path / "output"
+
+    for formatversion in ["FV2410", "FV2504"]:
+        csv_dir = input_dir / formatversion / "nachrichtenformat_1" / "csv"
+        csv_dir.mkdir(parents=True)
+        for pruefid in ["55001", "55002"]:
+            shutil.copy(test_data_dir / f"{formatversion}_55001.csv", csv_dir / f"{pruefid}.csv")
+
+    process_ahb_files(input_dir, output_dir)
+
+    result_dir = output_dir / "FV2504_FV2410" / "nachrichtenformat_1"
+    for pruefid in ["55001", "55002"]:
+        assert (result_dir / f"{pruefid}.csv").stat().st_size > 0
+        assert (result_dir / f"{pruefid}.xlsx").stat().st_size > 0
+    assert (result_dir / "55001.csv").read_text(encoding="utf-8") == (result_dir / "55002.csv").read_text(
+        encoding="utf-8"
+    )
+
+
+def test_get_matching_files_reflects_directory_changes(tmp_path: Path) -> None:
+    """
+    test that repeated lookups of matching files reflect changes of the csv directories.
+    """
+    csv_dirs = [tmp_path / formatversion / "nachrichtenformat_1" / "csv" for formatversion in ["FV2410", "FV2504"]]
+    for csv_dir in csv_dirs:
+        csv_dir.mkdir(parents=True)
+        (csv_dir / "pruefid_1.csv").write_text("content_1")
+
+    matches = get_matching_csv_files(
+        root_dir=tmp_path, previous_formatversion="FV2410", subsequent_formatversion="FV2504"
+    )
+    assert len(matches) == 1
+
+    for csv_dir in csv_dirs:
+        (csv_dir / "pruefid_2.csv").write_text("content_2")
+
+    matches = get_matching_csv_files(
+        root_dir=tmp_path, previous_formatversion="FV2410", subsequent_formatversion="FV2504"
+    )
+    assert [match[3] for match in matches] == ["pruefid_1", "pruefid_2"]
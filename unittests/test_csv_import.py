@@ -3,7 +3,7 @@ from pathlib import Path
 
 import pytest
 
-from ahlbatross.formats.csv import load_csv_files
+from ahlbatross.formats.csv import get_csv_files, load_csv_files
 from ahlbatross.models.ahb import AhbRow
 
 AHB_CSV_HEADER = (
@@ -155,3 +155,69 @@ def test_load_csv_without_segmentname_column() -> None:
                 previous_formatversion="FV2410",
                 subsequent_formatversion="FV2504",
             )
+
+
+def test_load_csv_short_rows_and_blank_lines() -> None:
+    """
+    Test loading <pruefid>.csv with blank lines and rows that contain fewer entries than the header.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir_path = Path(temp_dir)
+
+        previous_ahb_csv = temp_dir_path / "previous_pruefid.csv"
+        with open(previous_ahb_csv, "w", encoding="utf-8") as f:
+            f.write(AHB_CSV_HEADER)
+            f.write("Nachrichten-Kopfsegment,SG1,TST\n")
+            f.write("\n")
+            f.write("Beginn der Nachricht,SG1,BGM,,,,Z01,Description,Muss,\n")
+
+        subsequent_ahb_csv = temp_dir_path / "subsequent_pruefid.csv"
+        with open(subsequent_ahb_csv, "w", encoding="utf-8") as f:
+            f.write(AHB_CSV_HEADER)
+
+        previous_ahb_rows, subsequent_ahb_rows = load_csv_files(
+            previous_ahb_csv, subsequent_ahb_csv, previous_formatversion="FV2410", subsequent_formatversion="FV2504"
+        )
+
+        assert len(previous_ahb_rows) == 2
+        assert len(subsequent_ahb_rows) == 0
+
+        assert previous_ahb_rows[0].segment_code == "TST"
+        assert previous_ahb_rows[0].data_element is None
+        assert previous_ahb_rows[0].conditions is None
+
+        assert previous_ahb_rows[1].section_name == "Beginn der Nachricht"
+        assert previous_ahb_rows[1].value_pool_entry == "Z01"
+        assert previous_ahb_rows[1].ahb_expression == "Muss"
+
+        # header-only files without `Segmentname` column do not contain any rows
+        header_only_csv = temp_dir_path / "header_only_pruefid.csv"
+        with open(header_only_csv, "w", encoding="utf-8") as f:
+            f.write("Foo,Bar\n")
+
+        header_only_rows, _ = load_csv_files(
+            header_only_csv, subsequent_ahb_csv, previous_formatversion="FV2410", subsequent_formatversion="FV2504"
+        )
+
+        assert not header_only_rows
+
+
+def test_get_csv_files_reflects_directory_changes(tmp_path: Path) -> None:
+    """
+    Test that repeated listings of a csv directory reflect changes of its contents.
+    """
+    csv_dir = tmp_path / "csv"
+    assert get_csv_files(csv_dir) == []
+
+    # a regular file in place of the csv directory does not contain any csv files either
+    csv_dir.write_text("no directory")
+    assert get_csv_files(csv_dir) == []
+    csv_dir.unlink()
+
+    csv_dir.mkdir()
+    (csv_dir / "pruefid_2.csv").write_text(AHB_CSV_HEADER)
+    assert get_csv_files(csv_dir) == [csv_dir / "pruefid_2.csv"]
+
+    (csv_dir / "pruefid_1.csv").write_text(AHB_CSV_HEADER)
+    (csv_dir / "notes.txt").write_text("no csv")
+    assert get_csv_files(csv_dir) == [csv_dir / "pruefid_1.csv", csv_dir / "pruefid_2.csv"]
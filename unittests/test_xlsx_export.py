@@ -3,11 +3,14 @@ Tests for Excel export functionality.
 """
 
 from pathlib import Path
-from typing import List, NamedTuple
+from typing import Any, Dict, List, NamedTuple
 
 import openpyxl  # type: ignore
+import pytest
+from xlsxwriter import Workbook  # type: ignore
 
 from ahlbatross.enums.diff_types import DiffType
+from ahlbatross.formats import xlsx
 from ahlbatross.formats.xlsx import export_to_xlsx
 from ahlbatross.models.ahb import AhbRow, AhbRowComparison, AhbRowDiff
 
@@ -169,3 +172,40 @@ def test_xlsx_export_large_dataset(temp_excel_file: Path, formatversions: Format
     workbook = openpyxl.load_workbook(temp_excel_file)
     sheet = workbook.active
     assert sheet.max_row == len(comparisons) + 1  # data rows + 1 (header)
+
+
+def test_xlsx_export_constant_memory(
+    temp_excel_file: Path,
+    all_diff_types_ahb_row_comparisons: List[AhbRowComparison],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test that sheets exceeding the row threshold are exported completely in `constant_memory` mode.
+    """
+    created_workbooks: List[Any] = []
+
+    def _capture_workbook(filename: str, options: Dict[str, bool]) -> Any:
+        created_workbook = Workbook(filename, options)
+        created_workbooks.append(created_workbook)
+        return created_workbook
+
+    monkeypatch.setattr(xlsx, "Workbook", _capture_workbook)
+
+    # sheets below the threshold are written in the default mode
+    export_to_xlsx(all_diff_types_ahb_row_comparisons, str(temp_excel_file))
+    assert created_workbooks[-1].constant_memory is False
+
+    monkeypatch.setattr(xlsx, "CONSTANT_MEMORY_ROW_THRESHOLD", 0)
+
+    export_to_xlsx(all_diff_types_ahb_row_comparisons, str(temp_excel_file))
+    assert created_workbooks[-1].constant_memory is True
+    assert all(worksheet.constant_memory for worksheet in created_workbooks[-1].worksheets())
+
+    workbook = openpyxl.load_workbook(temp_excel_file)
+    sheet = workbook.active
+
+    assert sheet.max_row == len(all_diff_types_ahb_row_comparisons) + 1
+    assert "Segmentname" in sheet.cell(row=1, column=2).value
+    diff_values = [sheet.cell(row=i, column=11).value or "" for i in range(2, sheet.max_row + 1)]
+    assert diff_values == [comp.diff.diff_type.value for comp in all_diff_types_ahb_row_comparisons]
+    assert sheet.cell(row=3, column=13).value == "SG2"